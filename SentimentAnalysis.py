@@ -3,42 +3,124 @@ Reddit-Focused Sentiment Analysis for Philippine Food Companies Tariff Impact
 Analyzes sentiment from Reddit discussions about Trump tariffs on Philippines
 """
 
+import importlib.util
 import subprocess
 import sys
 
 def install_requirements():
-    """Install required packages"""
-    packages = ['requests', 'beautifulsoup4', 'pandas', 'nltk', 'textblob', 'praw', 'numpy']
+    """Install required packages that are not already importable"""
+    # pip package name -> importable module name
+    packages = {
+        'aiohttp': 'aiohttp', 'beautifulsoup4': 'bs4', 'pandas': 'pandas', 'nltk': 'nltk',
+        'textblob': 'textblob', 'praw': 'praw', 'numpy': 'numpy', 'orjson': 'orjson',
+        'pyarrow': 'pyarrow', 'zstandard': 'zstandard'
+    }
+    missing = [package for package, module in packages.items()
+               if importlib.util.find_spec(module) is None]
     
-    for package in packages:
-        try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-        except subprocess.CalledProcessError:
-            print(f"Failed to install {package}")
+    if not missing:
+        return
+    
+    print(f"Installing required packages: {', '.join(missing)}")
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *missing])
+    except subprocess.CalledProcessError:
+        print(f"Failed to install {', '.join(missing)}")
 
 # Install packages first
-print("Installing required packages...")
 install_requirements()
 
-import requests
+import asyncio
+import aiohttp
+import orjson
+import zstandard
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from textblob import TextBlob
+# TextBlob's pattern-based polarity scorer; PatternAnalyzer.analyze wraps this but
+# builds a new namedtuple class on every call
+from textblob.en import sentiment as pattern_sentiment
 import praw
 import re
-from datetime import datetime
-import json
+import hashlib
+import time
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dateutil.tz import tzlocal
 
 # Constants
 DELETED_TEXT = '[deleted]'
+INVALID_BODIES = frozenset((DELETED_TEXT, '[removed]', None))
+URL_RE = re.compile(r'http\S+|www\S+')
+TAG_RE = re.compile(r'@\w+|#\w+')
+EMPTY_SCORES = (0, 0, 0, 1, 0, 0)  # (compound, pos, neg, neu, polarity, length)
+PARALLEL_MIN_TEXTS = 500           # Below this, process startup outweighs the gain
+PARALLEL_CHUNKSIZE = 64
+MAX_CONCURRENT_REQUESTS = 5
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5                # Seconds, doubled after each retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_AFTER_MAX = 60               # Cap on a server-requested Retry-After wait, in seconds
+CACHE_DIR = Path('.reddit_cache')  # zstd-compressed raw JSON responses, keyed by URL hash
+CACHE_MAX_AGE = 6 * 60 * 60        # Seconds before a cached response is fetched again
+PH_TICKERS = ('jfc', 'urc', 'cnpf', 'gsmi', 'monde')
+PH_MARKET_TERMS = ('psei', 'pse', 'philippine stock', 'manila stock')
+
+# Download required NLTK data, skipping the network round-trip when it is already present
+for resource, path in [('vader_lexicon', 'sentiment/vader_lexicon.zip'), ('punkt', 'tokenizers/punkt')]:
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        try:
+            nltk.download(resource, quiet=True)
+        except Exception:
+            pass
+
+def score_cleaned_text(text, vader):
+    """Score a cleaned text as (compound, pos, neg, neu, polarity, length)"""
+    if not text:
+        return EMPTY_SCORES
+    
+    try:
+        # VADER analysis
+        vader_scores = vader.polarity_scores(text)
+        
+        # TextBlob analysis
+        textblob_polarity = pattern_sentiment(text)[0]
+        
+        return (vader_scores['compound'], vader_scores['pos'], vader_scores['neg'],
+                vader_scores['neu'], textblob_polarity, len(text))
+    except Exception:
+        return EMPTY_SCORES
+
+def round_scores(values, ndigits=4):
+    """Round a float array with Python's correctly rounded round()
+    
+    np.round scales by 10**ndigits before rounding, which can turn a value just
+    above a half into an exact tie and round it the wrong way.
+    """
+    return np.array([round(value, ndigits) for value in values.tolist()])
 
-# Download required NLTK data
-try:
-    nltk.download('vader_lexicon', quiet=True)
-    nltk.download('punkt', quiet=True)
-except Exception:
-    pass
+# VADER scorer for pool worker processes. The parent sets it before starting the
+# pool, so forked workers inherit the loaded lexicon via copy-on-write; spawned
+# workers re-import the module and load it once in _init_worker
+_worker_vader = None
+
+def _init_worker():
+    """Load the VADER lexicon once when a pool worker starts, unless inherited"""
+    global _worker_vader
+    if _worker_vader is None:
+        _worker_vader = SentimentIntensityAnalyzer()
+
+def _score_in_worker(text):
+    """Score a cleaned text inside a ProcessPoolExecutor worker"""
+    return score_cleaned_text(text, _worker_vader)
 
 class TariffSentimentAnalyzer:
     def __init__(self):
@@ -64,64 +146,125 @@ class TariffSentimentAnalyzer:
         # All keywords combined for filtering
         self.keywords = (self.food_companies + self.stock_keywords + 
                         self.tariff_keywords + self.philippines_keywords)
-        
-    def analyze_sentiment(self, text):
-        """Analyze sentiment using VADER and TextBlob"""
+        # Lowercased copies for substring matching against lowercased text
+        self.food_companies_lower = tuple(keyword.lower() for keyword in self.food_companies)
+        self.stock_keywords_lower = tuple(keyword.lower() for keyword in self.stock_keywords)
+        self.tariff_keywords_lower = tuple(keyword.lower() for keyword in self.tariff_keywords)
+        self.philippines_keywords_lower = tuple(keyword.lower() for keyword in self.philippines_keywords)
+        # Precompiled alternations for the search filter, one regex scan per category
+        self.tariff_re = self._keyword_pattern(self.tariff_keywords)
+        self.philippines_re = self._keyword_pattern(self.philippines_keywords)
+        # Sentiment results keyed by text, reused for repeated posts/comments; texts
+        # preprocess() rejects as too short come back empty and are never scored
+        self._sentiment_cache = {'': EMPTY_SCORES}
+    
+    @staticmethod
+    def _keyword_pattern(keywords):
+        """Compile a keyword list into one alternation matched against lowercased text"""
+        return re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords))
+    
+    def preprocess(self, text):
+        """Clean text for sentiment scoring; texts too short to score become empty"""
         if not text or len(text.strip()) < 5:
-            return self._empty_sentiment()
-            
-        # Clean text
-        text = re.sub(r'http\S+|www\S+', '', text)  # Remove URLs
-        text = re.sub(r'@\w+|#\w+', '', text)       # Remove mentions/hashtags
-        text = text.strip()
+            return ''
+        
+        # Substring checks are far cheaper than a regex miss, and most comments have neither
+        if 'http' in text or 'www' in text:
+            text = URL_RE.sub('', text)  # Remove URLs
+        if '@' in text or '#' in text:
+            text = TAG_RE.sub('', text)  # Remove mentions/hashtags
+        return text.strip()
+    
+    def preprocess_batch(self, texts):
+        """Clean many texts at once, running preprocess() once per distinct text"""
+        cleaned = {text: self.preprocess(text) for text in dict.fromkeys(texts)}
+        return [cleaned[text] for text in texts]
+        
+    def analyze_sentiment(self, text, preclean=False):
+        """Analyze sentiment of a single text using VADER and TextBlob"""
+        batch = self.analyze_sentiment_batch([text], preclean)
+        return {column: values.tolist()[0] for column, values in batch.items()}
+    
+    def analyze_sentiment_batch(self, texts, preclean=False):
+        """Analyze sentiment of many texts, combining and classifying with NumPy
         
-        if not text:
-            return self._empty_sentiment()
+        Pass preclean=True when the texts have already been through preprocess().
+        """
+        if not preclean:
+            texts = self.preprocess_batch(texts)
+        
+        self._score_uncached(texts)
+        raw = np.array([self._sentiment_cache[text] for text in texts], dtype=float).reshape(-1, 6)
+        compound, positive, negative, neutral, polarity, length = raw.T
+        
+        # Combined score (weighted average)
+        combined = (compound + polarity) / 2
+        
+        # Classify sentiment
+        labels = np.where(combined >= 0.1, 'Positive',
+                          np.where(combined <= -0.1, 'Negative', 'Neutral')).astype(object)
         
-        try:
-            # VADER analysis
-            vader_scores = self.vader.polarity_scores(text)
-            
-            # TextBlob analysis
-            blob = TextBlob(text)
-            textblob_polarity = blob.sentiment.polarity
-            
-            # Combined score (weighted average)
-            combined_score = (vader_scores['compound'] + textblob_polarity) / 2
-            
-            # Classify sentiment
-            if combined_score >= 0.1:
-                sentiment_label = 'Positive'
-            elif combined_score <= -0.1:
-                sentiment_label = 'Negative'
-            else:
-                sentiment_label = 'Neutral'
-            
-            return {
-                'vader_compound': round(vader_scores['compound'], 4),
-                'vader_positive': round(vader_scores['pos'], 4),
-                'vader_negative': round(vader_scores['neg'], 4),
-                'vader_neutral': round(vader_scores['neu'], 4),
-                'textblob_polarity': round(textblob_polarity, 4),
-                'combined_score': round(combined_score, 4),
-                'sentiment_label': sentiment_label,
-                'text_length': len(text)
-            }
-        except Exception:
-            return self._empty_sentiment()
-    
-    def _empty_sentiment(self):
-        """Return empty sentiment scores"""
         return {
-            'vader_compound': 0, 'vader_positive': 0, 'vader_negative': 0, 
-            'vader_neutral': 1, 'textblob_polarity': 0, 'combined_score': 0,
-            'sentiment_label': 'Neutral', 'text_length': 0
+            'vader_compound': round_scores(compound),
+            'vader_positive': round_scores(positive),
+            'vader_negative': round_scores(negative),
+            'vader_neutral': round_scores(neutral),
+            'textblob_polarity': round_scores(polarity),
+            'combined_score': round_scores(combined),
+            'sentiment_label': labels,
+            'text_length': length.astype(int)
         }
+    
+    def _score_uncached(self, texts):
+        """Score cleaned texts missing from the cache, in parallel for large batches"""
+        global _worker_vader
+        pending = [text for text in dict.fromkeys(texts) if text not in self._sentiment_cache]
+        
+        if len(pending) >= PARALLEL_MIN_TEXTS:
+            _worker_vader = self.vader
+            try:
+                with ProcessPoolExecutor(initializer=_init_worker) as executor:
+                    scores = list(executor.map(_score_in_worker, pending,
+                                               chunksize=PARALLEL_CHUNKSIZE))
+            except Exception as e:
+                print(f"Parallel scoring failed, scoring serially: {e}")
+                scores = [self._score_text(text) for text in pending]
+        else:
+            scores = [self._score_text(text) for text in pending]
+        
+        self._sentiment_cache.update(zip(pending, scores))
+    
+    def _score_text(self, text):
+        """Score a cleaned text in this process"""
+        return score_cleaned_text(text, self.vader)
+
+@dataclass(slots=True)
+class RedditRecord:
+    """A scraped Reddit post, search result or comment"""
+    type: str
+    id: str
+    title: str
+    text: str
+    score: int
+    created_utc: float
+    author: str
+    subreddit: str
+    url: str = ''
+    num_comments: int = 0
+    level: int = 0
+    relevance_score: int = 0
+    search_term: str = ''
 
 class RedditScraper:
     def __init__(self):
         self.analyzer = TariffSentimentAnalyzer()
         self.headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        # Caps in-flight requests to stay within Reddit's rate limits
+        self._request_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Parsed JSON keyed by URL, so repeated fetches skip the network
+        self._response_cache = {}
+        # Post IDs already collected, so overlapping searches skip repeats
+        self._seen_ids = set()
     
     def calculate_relevance_score(self, text):
         """Calculate relevance score for a post based on keyword matches"""
@@ -129,62 +272,121 @@ class RedditScraper:
         score = 0
         
         # HIGHEST value: Philippine food company mentions (5 points each)
-        ph_food_companies = ['jfc', 'urc', 'cnpf', 'gsmi', 'monde']
-        for ticker in ph_food_companies:
-            if ticker.lower() in text_lower:
+        for ticker in PH_TICKERS:
+            if ticker in text_lower:
                 score += 5
         
         # High value: specific food company names (3 points each)
-        for company in self.analyzer.food_companies:
-            if company.lower() in text_lower:
-                score += 3
+        score += 3 * sum(company in text_lower for company in self.analyzer.food_companies_lower)
         
         # High value: Philippines mentions (3 points each) - weighted more
-        for ph_term in self.analyzer.philippines_keywords:
-            if ph_term.lower() in text_lower:
-                score += 3
+        score += 3 * sum(ph_term in text_lower for ph_term in self.analyzer.philippines_keywords_lower)
         
         # Medium value: stock/financial terms (2 points each)
-        for stock_term in self.analyzer.stock_keywords:
-            if stock_term.lower() in text_lower:
-                score += 2
+        score += 2 * sum(stock_term in text_lower for stock_term in self.analyzer.stock_keywords_lower)
         
         # Medium value: specific tariff mentions (2 points each)
-        for tariff_term in self.analyzer.tariff_keywords:
-            if tariff_term.lower() in text_lower:
-                score += 2
+        score += 2 * sum(tariff_term in text_lower for tariff_term in self.analyzer.tariff_keywords_lower)
         
         # Bonus points for Philippine-specific financial terms
-        ph_specific = ['psei', 'pse', 'philippine stock', 'manila stock']
-        for term in ph_specific:
+        for term in PH_MARKET_TERMS:
             if term in text_lower:
                 score += 4
         
         return score
         
-    def scrape_specific_thread(self, thread_url):
+    async def _fetch_json(self, session, url):
+        """GET a Reddit JSON endpoint, raising ClientResponseError on non-200 responses
+        
+        Rate-limit and server errors, dropped connections and timeouts are retried
+        with exponential backoff (or the server's Retry-After, if longer), and
+        successful responses are cached by URL for the life of the scraper and
+        on disk, so re-runs within CACHE_MAX_AGE skip the network.
+        """
+        if url in self._response_cache:
+            return self._response_cache[url]
+        
+        cache_path = CACHE_DIR / hashlib.sha1(url.encode()).hexdigest()
+        data = self._read_disk_cache(cache_path)
+        if data is not None:
+            self._response_cache[url] = data
+            return data
+        
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF * 2 ** attempt
+            try:
+                async with self._request_limit:
+                    async with session.get(url) as response:
+                        if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                            response.raise_for_status()
+                            raw = await response.read()
+                            data = orjson.loads(raw)
+                            self._response_cache[url] = data
+                            self._write_disk_cache(cache_path, raw)
+                            return data
+                        delay = max(delay, self._retry_after(response))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+            
+            # Back off outside the semaphore so other requests can proceed
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _retry_after(response):
+        """Seconds the Retry-After header asks us to wait, capped; 0 if absent or invalid"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return 0
+        try:
+            seconds = float(value)
+        except ValueError:
+            # HTTP-date form
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return 0
+        return min(max(seconds, 0), RETRY_AFTER_MAX)
+    
+    @staticmethod
+    def _read_disk_cache(cache_path):
+        """Load a fresh cached response, or None if missing, stale or unreadable"""
+        try:
+            if time.time() - cache_path.stat().st_mtime > CACHE_MAX_AGE:
+                return None
+            return orjson.loads(zstandard.ZstdDecompressor().decompress(cache_path.read_bytes()))
+        except (OSError, zstandard.ZstdError, orjson.JSONDecodeError):
+            return None
+    
+    @staticmethod
+    def _write_disk_cache(cache_path, raw):
+        """Store a raw JSON response compressed; caching failures are not fatal"""
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            cache_path.write_bytes(zstandard.ZstdCompressor(level=3).compress(raw))
+        except OSError as e:
+            print(f"Could not cache response: {e}")
+    
+    async def scrape_specific_thread(self, session, thread_url):
         """Scrape specific Reddit thread without authentication"""
         try:
             # Extract submission ID from URL
             submission_id = thread_url.split('/')[-3] if 'comments' in thread_url else thread_url.split('/')[-1]
             
-            # Use requests to get thread data
+            # Use the shared aiohttp session to get thread data
             json_url = f"https://www.reddit.com/comments/{submission_id}.json"
             
-            response = requests.get(json_url, headers=self.headers)
+            data = await self._fetch_json(session, json_url)
+            return self._parse_reddit_json(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_reddit_json(data)
-            else:
-                print(f"Failed to fetch Reddit data: {response.status_code}")
-                return []
-                
+        except aiohttp.ClientResponseError as e:
+            print(f"Failed to fetch Reddit data: {e.status}")
+            return []
         except Exception as e:
             print(f"Error scraping Reddit thread: {e}")
             return []
     
-    def search_related_threads(self, search_terms):
+    async def search_related_threads(self, session, search_terms):
         """Search for related Reddit threads using Reddit search"""
         all_posts = []
         
@@ -192,30 +394,30 @@ class RedditScraper:
         ph_subreddits = ['Philippines', 'phinvest', 'PHStocks', 'PHStrategy', 
                         'PHFinance', 'PHBusiness', 'pinoyinvestors']
         
+        search_requests = []
         for term in search_terms:
-            try:
-                # First try searching in Philippine subreddits
-                for subreddit in ph_subreddits:
-                    subreddit_url = f"https://www.reddit.com/r/{subreddit}/search.json?q={term}&restrict_sr=1&sort=relevance&limit=5"
-                    response = requests.get(subreddit_url, headers=self.headers)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = self._parse_search_results(data, term)
-                        all_posts.extend(posts)
-                
-                # Then do a general search with the term
-                search_url = f"https://www.reddit.com/search.json?q={term}&sort=relevance&limit=10"
-                response = requests.get(search_url, headers=self.headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    posts = self._parse_search_results(data, term)
-                    all_posts.extend(posts)
-                    
-            except Exception as e:
-                print(f"Error searching for '{term}': {e}")
+            # First try searching in Philippine subreddits
+            for subreddit in ph_subreddits:
+                subreddit_url = f"https://www.reddit.com/r/{subreddit}/search.json?q={term}&restrict_sr=1&sort=relevance&limit=5"
+                search_requests.append((term, subreddit_url))
+            
+            # Then do a general search with the term
+            search_url = f"https://www.reddit.com/search.json?q={term}&sort=relevance&limit=10"
+            search_requests.append((term, search_url))
+        
+        # Fire all searches concurrently; results come back in request order
+        results = await asyncio.gather(
+            *(self._fetch_json(session, url) for _, url in search_requests),
+            return_exceptions=True
+        )
+        
+        for (term, _), data in zip(search_requests, results):
+            if isinstance(data, aiohttp.ClientResponseError):
+                continue  # Non-200 responses are skipped
+            if isinstance(data, Exception):
+                print(f"Error searching for '{term}': {data}")
                 continue
+            all_posts.extend(self._parse_search_results(data, term))
         
         return all_posts
     
@@ -227,22 +429,11 @@ class RedditScraper:
             for post in search_data['data']['children']:
                 post_data = post['data']
                 
-                # Enhanced relevance filtering
-                title_lower = post_data.get('title', '').lower()
-                text_lower = post_data.get('selftext', '').lower()
-                full_text = title_lower + ' ' + text_lower
-                
-                # Check for food company mentions
-                has_food_company = any(company.lower() in full_text 
-                                     for company in self.analyzer.food_companies)
-                
-                # Check for Philippines context
-                has_philippines = any(ph.lower() in full_text 
-                                    for ph in self.analyzer.philippines_keywords)
-                
-                # Check for tariff context
-                has_tariff = any(tariff.lower() in full_text 
-                               for tariff in self.analyzer.tariff_keywords)
+                # Skip posts already returned for an earlier search term
+                post_id = post_data.get('id', '')
+                if post_id in self._seen_ids:
+                    continue
+                self._seen_ids.add(post_id)
                 
                 # Expanded list of noise subreddits to exclude
                 noise_subreddits = ['civ', 'gaming', 'memes', 'funny', 'pics', 
@@ -253,12 +444,20 @@ class RedditScraper:
                                   'unitedkingdom', 'france', 'germany', 'japan']
                 current_subreddit = post_data.get('subreddit', '').lower()
                 
+                # Cheapest rejection first, before any text scanning
                 if current_subreddit in noise_subreddits:
                     continue
                 
+                # Enhanced relevance filtering
+                title_lower = post_data.get('title', '').lower()
+                text_lower = post_data.get('selftext', '').lower()
+                full_text = title_lower + ' ' + text_lower
+                
                 # STRICT FILTER: Must have Philippines context AND tariffs
                 # Food company alone is not enough - must be Philippine-specific
-                if has_philippines and has_tariff:
+                # (short-circuits so the tariff scan only runs on Philippine posts)
+                if (self.analyzer.philippines_re.search(full_text)
+                        and self.analyzer.tariff_re.search(full_text)):
                     # Calculate relevance score
                     relevance_score = self.calculate_relevance_score(full_text)
                     
@@ -281,20 +480,20 @@ class RedditScraper:
                         min_score = 15  # Extremely high bar for all other subreddits
                     
                     if relevance_score >= min_score:
-                        posts.append({
-                            'type': 'search_result',
-                            'id': post_data.get('id', ''),
-                            'title': post_data.get('title', ''),
-                            'text': post_data.get('selftext', ''),
-                            'score': post_data.get('score', 0),
-                            'num_comments': post_data.get('num_comments', 0),
-                            'created_utc': datetime.fromtimestamp(post_data.get('created_utc', 0)),
-                            'author': post_data.get('author', DELETED_TEXT),
-                            'subreddit': post_data.get('subreddit', ''),
-                            'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                            'search_term': search_term,
-                            'relevance_score': relevance_score
-                        })
+                        posts.append(RedditRecord(
+                            type='search_result',
+                            id=post_id,
+                            title=post_data.get('title', ''),
+                            text=post_data.get('selftext', ''),
+                            score=post_data.get('score', 0),
+                            num_comments=post_data.get('num_comments', 0),
+                            created_utc=post_data.get('created_utc', 0),
+                            author=post_data.get('author', DELETED_TEXT),
+                            subreddit=post_data.get('subreddit', ''),
+                            url=f"https://reddit.com{post_data.get('permalink', '')}",
+                            search_term=search_term,
+                            relevance_score=relevance_score
+                        ))
         except Exception as e:
             print(f"Error parsing search results: {e}")
         
@@ -308,19 +507,20 @@ class RedditScraper:
             # Get main post
             main_post = json_data[0]['data']['children'][0]['data']
             
-            post_data = {
-                'type': 'post',
-                'id': main_post.get('id', ''),
-                'title': main_post.get('title', ''),
-                'text': main_post.get('selftext', ''),
-                'score': main_post.get('score', 0),
-                'num_comments': main_post.get('num_comments', 0),
-                'created_utc': datetime.fromtimestamp(main_post.get('created_utc', 0)),
-                'author': main_post.get('author', DELETED_TEXT),
-                'subreddit': main_post.get('subreddit', 'Philippines'),
-                'url': f"https://reddit.com{main_post.get('permalink', '')}"
-            }
+            post_data = RedditRecord(
+                type='post',
+                id=main_post.get('id', ''),
+                title=main_post.get('title', ''),
+                text=main_post.get('selftext', ''),
+                score=main_post.get('score', 0),
+                num_comments=main_post.get('num_comments', 0),
+                created_utc=main_post.get('created_utc', 0),
+                author=main_post.get('author', DELETED_TEXT),
+                subreddit=main_post.get('subreddit', 'Philippines'),
+                url=f"https://reddit.com{main_post.get('permalink', '')}"
+            )
             posts_data.append(post_data)
+            self._seen_ids.add(post_data.id)
             
             # Get comments
             if len(json_data) > 1:
@@ -332,103 +532,115 @@ class RedditScraper:
         
         return posts_data
     
-    def _parse_comments(self, comments, level=0, max_level=4):
-        """Parse Reddit comments recursively"""
+    def _parse_comments(self, comments, max_level=4):
+        """Parse a Reddit comment tree depth-first using an explicit stack"""
         comments_data = []
         
-        if level > max_level:
-            return comments_data
-            
-        for comment in comments:
-            parsed_comment = self._parse_single_comment(comment, level, max_level)
-            if parsed_comment:
-                comments_data.extend(parsed_comment)
-                
-        return comments_data
-    
-    def _parse_single_comment(self, comment, level, max_level):
-        """Parse a single Reddit comment"""
-        comments_data = []
+        # Children are pushed in reverse so they pop in their original order
+        stack = deque((comment, 0) for comment in reversed(comments))
         
-        try:
-            if comment['kind'] != 't1':  # Not a comment
-                return comments_data
-                
-            comment_data = comment['data']
+        while stack:
+            comment, level = stack.pop()
             
-            if self._is_valid_comment(comment_data):
-                comment_info = self._create_comment_info(comment_data, level)
-                comments_data.append(comment_info)
-                
-                # Parse replies
-                replies_data = self._parse_comment_replies(comment_data, level, max_level)
-                comments_data.extend(replies_data)
-                        
-        except Exception:
-            pass
-                
-        return comments_data
-    
-    def _is_valid_comment(self, comment_data):
-        """Check if comment data is valid"""
-        return comment_data.get('body') not in [DELETED_TEXT, '[removed]', None]
-    
-    def _create_comment_info(self, comment_data, level):
-        """Create comment info dictionary"""
-        return {
-            'type': 'comment',
-            'id': comment_data.get('id', ''),
-            'title': '',
-            'text': comment_data.get('body', ''),
-            'score': comment_data.get('score', 0),
-            'num_comments': 0,
-            'created_utc': datetime.fromtimestamp(comment_data.get('created_utc', 0)),
-            'author': comment_data.get('author', DELETED_TEXT),
-            'subreddit': 'Philippines',
-            'level': level
-        }
-    
-    def _parse_comment_replies(self, comment_data, level, max_level):
-        """Parse replies to a comment"""
-        if 'replies' not in comment_data or not comment_data['replies']:
-            return []
+            if not isinstance(comment, dict) or comment.get('kind') != 't1':  # Not a comment
+                continue
             
-        if not isinstance(comment_data['replies'], dict):
-            return []
+            # Skip malformed nodes rather than abandoning the rest of the thread
+            comment_data = comment.get('data')
+            if not isinstance(comment_data, dict):
+                continue
+            
+            body = comment_data.get('body')
+            
+            # Skip deleted/removed comments along with their replies
+            if body in INVALID_BODIES:
+                continue
+            
+            comments_data.append(RedditRecord(
+                type='comment',
+                id=comment_data.get('id', ''),
+                title='',
+                text=body,
+                score=comment_data.get('score', 0),
+                created_utc=comment_data.get('created_utc', 0),
+                author=comment_data.get('author', DELETED_TEXT),
+                subreddit='Philippines',
+                level=level
+            ))
             
-        replies = comment_data['replies']['data']['children']
-        return self._parse_comments(replies, level+1, max_level)
+            # Queue replies one level deeper, down to max_level
+            replies = comment_data.get('replies')
+            if level < max_level and isinstance(replies, dict):
+                replies_data = replies.get('data')
+                children = replies_data.get('children') if isinstance(replies_data, dict) else None
+                if isinstance(children, list):
+                    stack.extend((reply, level + 1) for reply in reversed(children))
+                
+        return comments_data
     
     def analyze_reddit_sentiment(self, posts_data):
         """Analyze sentiment of Reddit posts and comments"""
-        results = []
+        posts = []
+        full_texts = []
         
         for post in posts_data:
-            # Combine title and text for analysis
-            full_text = f"{post.get('title', '')} {post.get('text', '')}".strip()
+            # Combine title and text for analysis (comments have no title)
+            if post.type == 'comment':
+                full_text = post.text.strip()
+            else:
+                full_text = f"{post.title} {post.text}".strip()
             
             if full_text:
-                sentiment = self.analyzer.analyze_sentiment(full_text)
-                
-                result = {
-                    'date': post['created_utc'].strftime('%Y-%m-%d'),
-                    'datetime': post['created_utc'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'source': 'Reddit',
-                    'type': post['type'],
-                    'subreddit': post.get('subreddit', ''),
-                    'title': post.get('title', ''),
-                    'text': post.get('text', ''),
-                    'full_text': full_text,
-                    'score': post.get('score', 0),
-                    'author': post.get('author', ''),
-                    'level': post.get('level', 0),
-                    'url': post.get('url', ''),
-                    'relevance_score': post.get('relevance_score', 0),
-                    **sentiment
-                }
-                results.append(result)
-        
-        return pd.DataFrame(results)
+                posts.append(post)
+                full_texts.append(full_text)
+        
+        count = len(posts)
+        
+        # Convert Unix timestamps to local time and format them in one vectorized pass;
+        # the date is the leading 'YYYY-MM-DD' of the datetime string. A float64 array
+        # lets pd.to_datetime skip per-element type inference on a Python list
+        created_utc = np.fromiter((post.created_utc for post in posts), dtype=np.float64, count=count)
+        created = pd.Series(pd.to_datetime(created_utc, unit='s', utc=True)).dt.tz_convert(tzlocal())
+        # Strip the zone once converted: naive local times format straight from their
+        # integer fields, while tz-aware values go through a per-row Python strftime
+        datetimes = created.dt.tz_localize(None).dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Fill the result one column at a time; numeric columns are NumPy arrays
+        columns = {
+            'date': datetimes.str[:10],
+            'datetime': datetimes,
+            'source': ['Reddit'] * count,
+            'type': [post.type for post in posts],
+            'subreddit': [post.subreddit for post in posts],
+            'title': [post.title for post in posts],
+            'text': [post.text for post in posts],
+            'full_text': full_texts,
+            'score': np.fromiter((post.score for post in posts), dtype=np.int64, count=count),
+            'author': [post.author for post in posts],
+            'level': np.fromiter((post.level for post in posts), dtype=np.int64, count=count),
+            'url': [post.url for post in posts],
+            'relevance_score': np.fromiter((post.relevance_score for post in posts),
+                                           dtype=np.int64, count=count)
+        }
+        
+        # Clean each text once, then score the whole batch at once
+        cleaned_texts = self.analyzer.preprocess_batch(full_texts)
+        columns.update(self.analyzer.analyze_sentiment_batch(cleaned_texts, preclean=True))
+        
+        return pd.DataFrame(columns)
+
+async def collect_reddit_data(reddit_scraper, thread_url, search_terms):
+    """Run the thread scrape and related-thread search concurrently over one session"""
+    connector = aiohttp.TCPConnector(limit=10)
+    async with aiohttp.ClientSession(headers=reddit_scraper.headers, connector=connector) as session:
+        return await asyncio.gather(
+            reddit_scraper.scrape_specific_thread(session, thread_url),
+            reddit_scraper.search_related_threads(session, search_terms)
+        )
+
+def write_csv(df, path):
+    """Export a DataFrame to CSV using pyarrow's C++ writer"""
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
 
 def main():
     """Main execution function"""
@@ -445,19 +657,7 @@ def main():
     reddit_scraper = RedditScraper()
     all_sentiment_data = []
     
-    # 1. Scrape main Reddit thread
-    print("\\n1. Scraping main Reddit thread...")
     main_thread_url = "https://www.reddit.com/r/Philippines/comments/1lvofdb/trump_imposes_20_tariff_for_rate_for_philippines/"
-    reddit_posts = reddit_scraper.scrape_specific_thread(main_thread_url)
-    
-    if reddit_posts:
-        print(f"   [OK] Found {len(reddit_posts)} posts/comments in main thread")
-        all_sentiment_data.extend(reddit_posts)
-    else:
-        print("   [ERROR] No data found in main thread")
-    
-    # 2. Search for related discussions
-    print("\\n2. Searching for related Reddit discussions...")
     # Strictly Philippine-focused search terms
     search_terms = [
         "site:reddit.com/r/Philippines trump tariff",
@@ -472,7 +672,18 @@ def main():
         "Philippine stock exchange food companies tariff"
     ]
     
-    related_posts = reddit_scraper.search_related_threads(search_terms)
+    # 1 & 2. Scrape main thread and search related discussions concurrently
+    print("\\n1. Scraping main Reddit thread...")
+    print("\\n2. Searching for related Reddit discussions...")
+    reddit_posts, related_posts = asyncio.run(
+        collect_reddit_data(reddit_scraper, main_thread_url, search_terms))
+    
+    if reddit_posts:
+        print(f"   [OK] Found {len(reddit_posts)} posts/comments in main thread")
+        all_sentiment_data.extend(reddit_posts)
+    else:
+        print("   [ERROR] No data found in main thread")
+    
     if related_posts:
         print(f"   [OK] Found {len(related_posts)} related posts")
         all_sentiment_data.extend(related_posts)
@@ -483,29 +694,46 @@ def main():
     if all_sentiment_data:
         print("\\n3. Analyzing sentiment and exporting results...")
         
-        # Analyze sentiment
-        sentiment_df = reddit_scraper.analyze_reddit_sentiment(all_sentiment_data)
+        # The thread scrape and searches run concurrently, so a search may pick
+        # up the main post before the thread marks it seen; keep the first copy
+        seen_ids = set()
+        unique_posts = []
+        for post in all_sentiment_data:
+            if post.id not in seen_ids:
+                seen_ids.add(post.id)
+                unique_posts.append(post)
         
-        # Remove duplicates by URL
-        sentiment_df = sentiment_df.drop_duplicates(subset=['url'], keep='first')
+        # Analyze sentiment
+        sentiment_df = reddit_scraper.analyze_reddit_sentiment(unique_posts)
         
-        # Sort by relevance score first, then by date
-        sentiment_df['date'] = pd.to_datetime(sentiment_df['date'])
+        # Sort by relevance score first, then by date (ISO date strings sort chronologically)
         sentiment_df = sentiment_df.sort_values(['relevance_score', 'date'], ascending=[False, True])
         
         # Export detailed results
-        sentiment_df.to_csv('reddit_sentiment_detailed.csv', index=False)
+        write_csv(sentiment_df, 'reddit_sentiment_detailed.csv')
         print(f"   [OK] Exported detailed analysis: reddit_sentiment_detailed.csv")
         
-        # Create daily summary
-        daily_summary = sentiment_df.groupby(['date', 'subreddit']).agg({
-            'combined_score': ['mean', 'std', 'count'],
-            'sentiment_label': lambda x: x.value_counts().to_dict()
-        }).round(4)
-        
-        daily_summary.columns = ['avg_sentiment', 'sentiment_std', 'count', 'sentiment_breakdown']
-        daily_summary = daily_summary.reset_index()
-        daily_summary.to_csv('reddit_daily_summary.csv', index=False)
+        # Columnar copy for downstream analytical tools
+        sentiment_df.to_parquet('reddit_sentiment_detailed.parquet', engine='pyarrow',
+                                compression='zstd', index=False)
+        print(f"   [OK] Exported detailed analysis: reddit_sentiment_detailed.parquet")
+        
+        # Create daily summary in a single groupby pass; label counts are sums of
+        # boolean indicator columns, so no separate crosstab is needed
+        labels = sentiment_df['sentiment_label']
+        daily_summary = sentiment_df.assign(
+            is_positive=labels == 'Positive',
+            is_negative=labels == 'Negative',
+            is_neutral=labels == 'Neutral'
+        ).groupby(['date', 'subreddit']).agg(
+            avg_sentiment=('combined_score', 'mean'),
+            sentiment_std=('combined_score', 'std'),
+            count=('combined_score', 'count'),
+            positive_count=('is_positive', 'sum'),
+            negative_count=('is_negative', 'sum'),
+            neutral_count=('is_neutral', 'sum')
+        ).round(4).reset_index()
+        write_csv(daily_summary, 'reddit_daily_summary.csv')
         print(f"   [OK] Exported daily summary: reddit_daily_summary.csv")
         
         # Generate analysis results
@@ -532,26 +760,29 @@ def main():
         for subreddit, data in subreddit_summary.iterrows():
             print(f"  r/{subreddit}: {data['sentiment_label']} items, avg sentiment {data['combined_score']:.3f}")
         
+        # Narrow view with just the columns the top-N reports print
+        report_df = sentiment_df[['subreddit', 'title', 'score', 'relevance_score', 'combined_score']]
+        
         # Most engaging posts
         print("\\nMost upvoted posts:")
-        top_upvoted = sentiment_df.nlargest(3, 'score')[['subreddit', 'title', 'score', 'combined_score']]
+        top_upvoted = report_df.nlargest(3, 'score')[['subreddit', 'title', 'score', 'combined_score']]
         for _, item in top_upvoted.iterrows():
             print(f"  r/{item['subreddit']}: {item['title'][:50]}... ({item['score']} upvotes, sentiment: {item['combined_score']:.3f})")
         
         # Most relevant posts (new section)
         print("\\nMost relevant posts (by relevance score):")
-        top_relevant = sentiment_df.nlargest(5, 'relevance_score')[['subreddit', 'title', 'relevance_score', 'combined_score']]
+        top_relevant = report_df.nlargest(5, 'relevance_score')[['subreddit', 'title', 'relevance_score', 'combined_score']]
         for _, item in top_relevant.iterrows():
             print(f"  r/{item['subreddit']}: {item['title'][:50]}... (relevance: {item['relevance_score']}, sentiment: {item['combined_score']:.3f})")
         
         # Most positive/negative sentiment
         print("\\nMost positive sentiment:")
-        top_positive = sentiment_df.nlargest(3, 'combined_score')[['subreddit', 'title', 'combined_score']]
+        top_positive = report_df.nlargest(3, 'combined_score')[['subreddit', 'title', 'combined_score']]
         for _, item in top_positive.iterrows():
             print(f"  r/{item['subreddit']}: {item['title'][:50]}... ({item['combined_score']:.3f})")
         
         print("\\nMost negative sentiment:")
-        top_negative = sentiment_df.nsmallest(3, 'combined_score')[['subreddit', 'title', 'combined_score']]
+        top_negative = report_df.nsmallest(3, 'combined_score')[['subreddit', 'title', 'combined_score']]
         for _, item in top_negative.iterrows():
             print(f"  r/{item['subreddit']}: {item['title'][:50]}... ({item['combined_score']:.3f})")
         
@@ -559,6 +790,7 @@ def main():
         print("REDDIT SENTIMENT ANALYSIS COMPLETE!")
         print("Files generated:")
         print("- reddit_sentiment_detailed.csv (complete results)")
+        print("- reddit_sentiment_detailed.parquet (complete results, columnar)")
         print("- reddit_daily_summary.csv (daily aggregated data)")
         print("="*60)
         